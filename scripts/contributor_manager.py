@@ -3,18 +3,48 @@ Contributor Manager - Handle contributor registry operations.
 """
 
 import argparse
+import copy
+import fcntl
+import json
 import os
 import sys
 import subprocess
-import tempfile
 import shutil
-import toml
+from concurrent.futures import ThreadPoolExecutor
+import msgpack
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+import tomli_w
+try:
+    import pygit2
+except ImportError:  # Fall back to the git CLI for local commits
+    pygit2 = None
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 sys.path.append(os.path.dirname(__file__))
 from utils import load_config, sanitize_filename, calculate_lines_changed, write_output_file
 
+# Persistent clone of the registry Gist, reused across invocations
+GIST_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'aossie_gist_mirror')
+
+# Parsed contributor files, stored as msgpack next to (not inside) the clone
+PARSED_CACHE_DIR = os.path.join(GIST_CACHE_DIR, 'parsed')
+
+# Latest revision of a single Gist file; the Gist URL is its registry_url without '.git'
+GIST_RAW_URL = '{gist_url}/raw/{filename}'
+
+# Shared HTTP session so repeated API calls reuse one keep-alive connection
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# Errors raised while committing, from either the git CLI or libgit2
+COMMIT_ERRORS = (subprocess.CalledProcessError,) + ((pygit2.GitError,) if pygit2 else ())
+
 
 class ContributorManager:
     """Manages contributor TOML files in GitHub Gist."""
@@ -26,45 +56,275 @@ class ContributorManager:
         self.gist_pat = gist_pat
         self.config = load_config()
         self.gist_url = self.config['gist']['registry_url']
+        
+        # Split the filename pattern once instead of formatting it per call
+        pattern = self.config['gist']['contributor_file_pattern']
+        self._file_prefix, placeholder, self._file_suffix = pattern.partition('{username}')
+        if not placeholder:
+            raise ValueError(f"contributor_file_pattern must contain {{username}}: {pattern}")
+        
         self.repo_dir = None
+        self._lock_file = None
+        # Parsed contributor files keyed by path, valid until the next clone/fetch
+        self._toml_cache: Dict[str, Dict[str, Any]] = {}
+        self._unpushed = False
+        self._repo = None
+        # Files already added to the sparse checkout
+        self._checked_out: set = set()
+        # Every file in the clone's tree, listed lazily by contributor_exists
+        self._filename_set: Optional[set] = None
+        # Files written with commit=False, waiting for commit_staged()
+        self._staged: List[str] = []
+    
+    def _contributor_filename(self, username: str) -> str:
+        """Build the registry filename for a GitHub username."""
+        return f"{self._file_prefix}{sanitize_filename(username)}{self._file_suffix}"
     
     def clone_gist(self):
-        """Clone Gist repository to temp directory."""
-        # Create unique temp directory to avoid race conditions
-        self.repo_dir = tempfile.mkdtemp(prefix='contributor_gist_')
+        """Clone Gist repository into the local cache, or refresh an existing clone."""
+        os.makedirs(GIST_CACHE_DIR, exist_ok=True)
+        
+        # Serialize access to the shared clone across concurrent runs; the lock
+        # is held for the lifetime of this manager and released on exit
+        self._lock_file = open(os.path.join(GIST_CACHE_DIR, '.lock'), 'w')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        
+        self.repo_dir = os.path.join(GIST_CACHE_DIR, 'repo')
+        self._repo = None
+        self._checked_out.clear()
+        self._filename_set = None
+        self._toml_cache.clear()
         
         # Clone with authentication
         auth_url = self.gist_url.replace('https://', f'https://{self.gist_pat}@')
         
         try:
+            if os.path.isdir(os.path.join(self.repo_dir, '.git')):
+                try:
+                    self._fetch_gist(auth_url)
+                    return
+                except subprocess.CalledProcessError:
+                    pass  # Cached clone is unusable, start over from a fresh clone
+            
+            # Remove whatever is left at the clone path (a broken clone or a
+            # half-finished one) so git clone gets an empty directory
+            if os.path.exists(self.repo_dir):
+                shutil.rmtree(self.repo_dir)
+            
+            # Blobless shallow clone: only the latest commit and its trees are
+            # transferred, file contents are fetched on demand
             subprocess.run(
-                ['git', 'clone', auth_url, self.repo_dir],
+                ['git', 'clone', '--filter=blob:none', '--depth=1', '--single-branch',
+                 '--no-tags', '--no-checkout', auth_url, self.repo_dir],
                 check=True,
                 capture_output=True,
                 text=True
             )
+            # Start with an empty sparse checkout; contributor files are
+            # materialized one at a time by _checkout_file
+            self._git('sparse-checkout', 'set', '--no-cone', '!/*')
+            self._git('checkout')
+            self._git('clean', '-ffdx')
         except subprocess.CalledProcessError as e:
             # Redact PAT from error message to prevent leakage
             safe_error = e.stderr.replace(self.gist_pat, '***REDACTED***')
             raise RuntimeError(f"Failed to clone Gist: {safe_error}")
     
+    def _fetch_gist(self, auth_url: str):
+        """Bring the cached clone up to date with the remote Gist."""
+        # Refresh the remote URL in case the PAT or registry URL changed
+        self._git('remote', 'set-url', 'origin', auth_url)
+        self._git('fetch', '--depth=1', '--filter=blob:none', 'origin')
+        # Discard anything left over from a previous run: unpushed commits from a
+        # failed push, and untracked files from a write that was never committed
+        self._git('reset', '--hard', 'origin/HEAD')
+        self._git('clean', '-ffdx')
+    
+    def _git(self, *args: str) -> subprocess.CompletedProcess:
+        """Run a git command inside the Gist clone."""
+        return subprocess.run(
+            ['git', '-C', self.repo_dir, *args],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    
+    def _checkout_file(self, filename: str) -> str:
+        """Add a single file to the sparse checkout and return its path."""
+        if filename not in self._checked_out:
+            self._checkout_files([filename])
+        
+        return os.path.join(self.repo_dir, filename)
+    
+    def _checkout_files(self, filenames: List[str]):
+        """Add files to the sparse checkout, fetching their blobs in one go."""
+        pending = [name for name in filenames if name not in self._checked_out]
+        if not pending:
+            return
+        
+        try:
+            self._git('sparse-checkout', 'add', *(f'/{name}' for name in pending))
+        except subprocess.CalledProcessError as e:
+            safe_error = e.stderr.replace(self.gist_pat, '***REDACTED***')
+            raise RuntimeError(f"Failed to fetch {', '.join(pending)} from Gist: {safe_error}")
+        
+        self._checked_out.update(pending)
+    
+    def _commit(self, filenames: List[str], message: str):
+        """
+        Stage files and commit them.
+        Runs in-process through libgit2 when pygit2 is available, otherwise via the git CLI.
+        """
+        if pygit2 is None:
+            # Only stderr is needed, and only to report a failure
+            subprocess.run(['git', '-C', self.repo_dir, 'add', *filenames],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            subprocess.run(['git', '-C', self.repo_dir, 'commit', '-m', message],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            return
+        
+        if self._repo is None:
+            # Blobs outside the sparse checkout are never fetched, so libgit2 must
+            # not insist that every tree entry exists locally when writing the tree
+            pygit2.settings.enable_strict_object_creation(False)
+            self._repo = pygit2.Repository(self.repo_dir)
+        
+        index = self._repo.index
+        index.read()  # Pick up sparse-checkout changes made by the git CLI
+        for filename in filenames:
+            index.add(filename)
+        index.write()
+        
+        signature = self._repo.default_signature
+        self._repo.create_commit('HEAD', signature, signature, message,
+                                 index.write_tree(), [self._repo.head.target])
+    
+    def _load_contributor_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Load a contributor TOML file, skipping the parse when possible.
+        Returns a copy, so a failed update can't corrupt the cache.
+        """
+        if file_path in self._toml_cache:
+            return copy.deepcopy(self._toml_cache[file_path])
+        
+        # Reuse the msgpack side-cache from an earlier run if the file is unchanged
+        stat = os.stat(file_path)
+        sidecar_path = os.path.join(PARSED_CACHE_DIR, os.path.basename(file_path) + '.mp')
+        try:
+            with open(sidecar_path, 'rb') as f:
+                cached = msgpack.unpackb(f.read(), raw=False)
+            if cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                self._toml_cache[file_path] = cached['data']
+                return copy.deepcopy(cached['data'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing, stale or unreadable; fall back to parsing
+        
+        with open(file_path, 'rb') as f:
+            contributor_data = tomllib.load(f)
+        
+        self._remember_contributor_file(file_path, contributor_data)
+        return copy.deepcopy(contributor_data)
+    
+    def _write_contributor_file(self, file_path: str, contributor_data: Dict[str, Any]):
+        """Atomically replace a contributor file and cache its contents."""
+        payload = tomli_w.dumps(contributor_data).encode('utf-8')
+        
+        # Write to a temp file and rename over the original, so a crash never
+        # leaves a truncated TOML behind
+        tmp_path = file_path + '.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, file_path)
+        except OSError:
+            # Don't leave the partial temp file behind in the persistent clone
+            os.unlink(tmp_path)
+            raise
+        
+        self._remember_contributor_file(file_path, contributor_data)
+    
+    def _remember_contributor_file(self, file_path: str, contributor_data: Dict[str, Any]):
+        """Record the parsed contents of a contributor file in both caches."""
+        self._toml_cache[file_path] = contributor_data
+        
+        stat = os.stat(file_path)
+        sidecar_path = os.path.join(PARSED_CACHE_DIR, os.path.basename(file_path) + '.mp')
+        try:
+            packed = msgpack.packb({
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'data': contributor_data
+            })
+        except TypeError:
+            return  # Values msgpack can't encode (e.g. TOML datetimes); parse next time
+        
+        os.makedirs(PARSED_CACHE_DIR, exist_ok=True)
+        with open(sidecar_path, 'wb') as f:
+            f.write(packed)
+    
+    def _gist_file_exists(self, filename: str) -> Optional[bool]:
+        """
+        Check for a single Gist file with a HEAD request on its raw URL.
+        Returns None if the request doesn't give a definitive answer.
+        """
+        gist_url = self.gist_url.rstrip('/')
+        if gist_url.endswith('.git'):
+            gist_url = gist_url[:-len('.git')]
+        
+        try:
+            response = _http.head(
+                GIST_RAW_URL.format(gist_url=gist_url, filename=filename),
+                headers={'Authorization': f'token {self.gist_pat}'},
+                allow_redirects=True,
+                timeout=10
+            )
+        except requests.RequestException:
+            return None
+        
+        if response.status_code == 200:
+            return True
+        if response.status_code == 404:
+            return False
+        return None
+    
     def contributor_exists(self, username: str) -> bool:
         """Check if contributor already exists in registry."""
+        filename = self._contributor_filename(username)
+        
+        # A HEAD request transfers headers only, far less than even a blobless
+        # clone; fall back to the clone when it can't give a definitive answer
         if not self.repo_dir:
+            exists = self._gist_file_exists(filename)
+            if exists is not None:
+                return exists
             self.clone_gist()
         
-        filename = self.config['gist']['contributor_file_pattern'].format(username=sanitize_filename(username))
-        file_path = os.path.join(self.repo_dir, filename)
+        # Most files are outside the sparse checkout, so list the tree once
+        # instead of materializing and stat()ing each file
+        if self._filename_set is None:
+            listing = self._git('ls-tree', '-z', '--name-only', 'HEAD').stdout
+            # Files written with commit=False exist on disk but not yet in HEAD
+            self._filename_set = set(filter(None, listing.split('\0'))) | set(self._staged)
         
-        return os.path.exists(file_path)
+        return filename in self._filename_set
     
-    def create_contributor(self, username: str, discord_id: str, wallet: str, pr_data: Dict[str, Any]) -> bool:
-        """Create new contributor entry."""
+    def create_contributor(self, username: str, discord_id: str, wallet: str, pr_data: Dict[str, Any],
+                           commit: bool = True) -> bool:
+        """
+        Create new contributor entry.
+        With commit=False the file is only written and left for commit_staged().
+        """
         if not self.repo_dir:
             self.clone_gist()
         
-        filename = self.config['gist']['contributor_file_pattern'].format(username=sanitize_filename(username))
-        file_path = os.path.join(self.repo_dir, filename)
+        filename = self._contributor_filename(username)
+        file_path = self._checkout_file(filename)
         
         # Create contributor data structure
         contributor_data = {
@@ -86,38 +346,34 @@ class ContributorManager:
             ]
         }
         
-        # Write TOML file
-        with open(file_path, 'w') as f:
-            toml.dump(contributor_data, f)
+        # Write TOML file, keeping the data so a follow-up add_pr needn't re-read it
+        self._write_contributor_file(file_path, contributor_data)
+        if self._filename_set is not None:
+            self._filename_set.add(filename)
         
-        # Commit and push
-        try:
-            subprocess.run(['git', '-C', self.repo_dir, 'add', filename], check=True)
-            subprocess.run(
-                ['git', '-C', self.repo_dir, 'commit', '-m', f'Add contributor: {username}'],
-                check=True
-            )
-            subprocess.run(['git', '-C', self.repo_dir, 'push'], check=True)
+        if not commit:
+            self._staged.append(filename)
             return True
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to commit/push: {e}")
-            return False
+        
+        return self._commit_changes([filename], f'Add contributor: {username}')
     
-    def add_pr_to_contributor(self, username: str, pr_data: Dict[str, Any]) -> bool:
-        """Add new PR to existing contributor."""
+    def add_pr_to_contributor(self, username: str, pr_data: Dict[str, Any], commit: bool = True) -> bool:
+        """
+        Add new PR to existing contributor.
+        With commit=False the file is only written and left for commit_staged().
+        """
         if not self.repo_dir:
             self.clone_gist()
         
-        filename = self.config['gist']['contributor_file_pattern'].format(username=sanitize_filename(username))
-        file_path = os.path.join(self.repo_dir, filename)
+        filename = self._contributor_filename(username)
+        file_path = self._checkout_file(filename)
         
         if not os.path.exists(file_path):
             print(f"Contributor file not found: {filename}")
             return False
         
         # Load existing data
-        with open(file_path, 'r') as f:
-            contributor_data = toml.load(f)
+        contributor_data = self._load_contributor_file(file_path)
         
         # Check if PR already exists to prevent duplicates
         existing_prs = contributor_data.get('pull_requests', [])
@@ -145,27 +401,173 @@ class ContributorManager:
         contributor_data['contributor']['total_prs'] = len(contributor_data['pull_requests'])
         
         # Write updated TOML
-        with open(file_path, 'w') as f:
-            toml.dump(contributor_data, f)
+        self._write_contributor_file(file_path, contributor_data)
         
-        # Commit and push
+        if not commit:
+            self._staged.append(filename)
+            return True
+        
+        return self._commit_changes([filename], f'Update contributor: {username} (PR #{pr_data["pr_number"]})')
+    
+    def _commit_changes(self, filenames: List[str], message: str) -> bool:
+        """Commit files locally; flush() pushes all pending commits at once."""
         try:
-            subprocess.run(['git', '-C', self.repo_dir, 'add', filename], check=True)
-            subprocess.run(
-                ['git', '-C', self.repo_dir, 'commit', '-m', f'Update contributor: {username} (PR #{pr_data["pr_number"]})'],
-                check=True
-            )
-            subprocess.run(['git', '-C', self.repo_dir, 'push'], check=True)
+            self._commit(filenames, message)
+            self._unpushed = True
+            return True
+        except COMMIT_ERRORS as e:
+            print(f"Failed to commit: {self._error_details(e)}")
+            return False
+    
+    def commit_staged(self, message: str) -> bool:
+        """Commit every file written with commit=False as a single commit."""
+        if not self._staged:
+            return True
+        
+        filenames = list(dict.fromkeys(self._staged))
+        if not self._commit_changes(filenames, message):
+            return False
+        
+        self._staged.clear()
+        return True
+    
+    def flush(self) -> bool:
+        """Push all commits made by create_contributor/add_pr_to_contributor."""
+        if not self._unpushed:
+            return True
+        
+        try:
+            subprocess.run(['git', '-C', self.repo_dir, 'push'],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            self._unpushed = False
             return True
         except subprocess.CalledProcessError as e:
-            print(f"Failed to commit/push: {e}")
+            print(f"Failed to push: {self._error_details(e)}")
+            return False
+    
+    def _error_details(self, error: Exception) -> str:
+        """Describe a git failure, including captured stderr with the PAT redacted."""
+        details = str(error)
+        stderr = getattr(error, 'stderr', None)
+        if stderr:
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode('utf-8', errors='replace')
+            details = f"{details}\n{stderr.strip()}"
+        return details.replace(self.gist_pat, '***REDACTED***')
+    
+    def run_batch(self, operations: List[Dict[str, Any]],
+                  max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Apply a list of create/add_pr operations in one clone and one commit.
+        Each operation is a dict with an 'action' key plus the fields of that action.
+        Different contributors are processed in parallel; operations on the same
+        contributor run in the order given.
+        """
+        if not self.repo_dir:
+            self.clone_gist()
+        
+        success = [False] * len(operations)
+        
+        # Group operations per contributor file so each file has a single writer
+        groups: Dict[str, List[int]] = {}
+        for i, op in enumerate(operations):
+            if not op.get('username'):
+                print(f"Batch operation {i} is missing: username")
+                continue
+            if not isinstance(op['username'], str):
+                print(f"Batch operation {i} needs username as a string")
+                continue
+            groups.setdefault(self._contributor_filename(op['username']), []).append(i)
+        
+        # Materialize every file up front; workers must not touch the git index
+        self._checkout_files(list(groups))
+        
+        def apply_group(indices: List[int]):
+            for i in indices:
+                success[i] = self._apply_operation(operations[i])
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            list(executor.map(apply_group, groups.values()))
+        
+        # One name per changed file; usernames differing only in case share a file
+        changed = [operations[groups[name][0]]['username'] for name in dict.fromkeys(self._staged)]
+        if changed:
+            noun = 'contributor' if len(changed) == 1 else 'contributors'
+            message = f"Update {len(changed)} {noun}\n\n" + '\n'.join(changed)
+            if not self.commit_staged(message):
+                success = [False] * len(operations)
+        
+        return [
+            {'action': op.get('action'), 'username': op.get('username'), 'success': ok}
+            for op, ok in zip(operations, success)
+        ]
+    
+    def _apply_operation(self, op: Dict[str, Any]) -> bool:
+        """Apply one batch operation without committing it."""
+        action = op.get('action')
+        username = op.get('username')
+        
+        if action not in REQUIRED_FIELDS:
+            print(f"Unknown batch action: {action}")
             return False
+        
+        missing = [name for name in REQUIRED_FIELDS[action] if op.get(name) is None]
+        if missing:
+            print(f"Batch {action} for {username} is missing: {', '.join(missing)}")
+            return False
+        
+        # Match the CLI's types; e.g. a string pr_number would defeat the duplicate check
+        try:
+            pr_number = int(op['pr_number'])
+            lines_changed = int(op.get('lines_changed') or 0)
+        except (TypeError, ValueError):
+            print(f"Batch {action} for {username} needs integer pr_number and lines_changed")
+            return False
+        
+        labels = op.get('labels') or []
+        if not isinstance(labels, list):
+            print(f"Batch {action} for {username} needs labels as a list")
+            return False
+        
+        pr_data = build_pr_data(pr_number, op.get('repo_name'), op.get('pr_title'), lines_changed, labels)
+        
+        try:
+            if action == 'create':
+                # Files were materialized by run_batch, so an existing one is on disk
+                if os.path.exists(os.path.join(self.repo_dir, self._contributor_filename(username))):
+                    print(f"Contributor {username} already exists, refusing to overwrite")
+                    return False
+                return self.create_contributor(username, op.get('discord_id'), op.get('wallet'), pr_data,
+                                               commit=False)
+            return self.add_pr_to_contributor(username, pr_data, commit=False)
+        except Exception as e:
+            print(f"Failed to {action} {username}: {e}")
+            return False
+
+
+# Fields each write action needs, shared by CLI validation and batch operations
+REQUIRED_FIELDS = {
+    'create': ['username', 'discord_id', 'wallet', 'pr_number', 'repo_name'],
+    'add_pr': ['username', 'pr_number', 'repo_name']
+}
+
+
+def build_pr_data(pr_number: int, repo_name: str, pr_title: Optional[str] = None,
+                  lines_changed: int = 0, labels: Optional[list] = None) -> Dict[str, Any]:
+    """Build the PR record passed to create_contributor/add_pr_to_contributor."""
+    return {
+        'pr_number': pr_number,
+        'repo_name': repo_name,
+        'pr_title': pr_title or '',
+        'lines_changed': lines_changed or 0,
+        'labels': labels or []
+    }
 
 
 def main():
     parser = argparse.ArgumentParser(description='Contributor registry management')
     parser.add_argument('--action', required=True, 
-                       choices=['check_exists', 'create', 'add_pr'])
+                       choices=['check_exists', 'create', 'add_pr', 'batch'])
     parser.add_argument('--username', help='GitHub username')
     parser.add_argument('--discord-id', help='Discord user ID')
     parser.add_argument('--wallet', help='Wallet address')
@@ -174,6 +576,7 @@ def main():
     parser.add_argument('--pr-title', help='PR title')
     parser.add_argument('--lines-changed', type=int, default=0, help='Lines changed')
     parser.add_argument('--labels', help='PR labels (JSON array string)')
+    parser.add_argument('--batch-file', help='JSON file with a list of create/add_pr operations')
     parser.add_argument('--gist-pat', required=True, help='GitHub PAT for Gist')
     parser.add_argument('--output-file', help='Output file for results')
     
@@ -184,27 +587,15 @@ def main():
         if not args.username:
             parser.error("--username is required for check_exists action")
     
-    elif args.action == 'create':
-        required_args = {
-            'username': args.username,
-            'discord-id': args.discord_id,
-            'wallet': args.wallet,
-            'pr-number': args.pr_number,
-            'repo-name': args.repo_name
-        }
-        missing = [name for name, value in required_args.items() if value is None]
+    elif args.action in REQUIRED_FIELDS:
+        missing = [name.replace('_', '-') for name in REQUIRED_FIELDS[args.action]
+                   if getattr(args, name) is None]
         if missing:
-            parser.error(f"create action requires: --{', --'.join(missing)}")
+            parser.error(f"{args.action} action requires: --{', --'.join(missing)}")
     
-    elif args.action == 'add_pr':
-        required_args = {
-            'username': args.username,
-            'pr-number': args.pr_number,
-            'repo-name': args.repo_name
-        }
-        missing = [name for name, value in required_args.items() if value is None]
-        if missing:
-            parser.error(f"add_pr action requires: --{', --'.join(missing)}")
+    elif args.action == 'batch':
+        if not args.batch_file:
+            parser.error("--batch-file is required for batch action")
     
     try:
         manager = ContributorManager(args.gist_pat)
@@ -217,42 +608,46 @@ def main():
             print(f"Contributor exists: {exists}")
         
         elif args.action == 'create':
-            import json
             labels = json.loads(args.labels) if args.labels else []
-            
-            pr_data = {
-                'pr_number': args.pr_number,
-                'repo_name': args.repo_name,
-                'pr_title': args.pr_title or '',
-                'lines_changed': args.lines_changed,
-                'labels': labels
-            }
+            pr_data = build_pr_data(args.pr_number, args.repo_name, args.pr_title, args.lines_changed, labels)
             
             success = manager.create_contributor(args.username, args.discord_id, args.wallet, pr_data)
-            if success:
+            if success and manager.flush():
                 print(f"✓ Created contributor: {args.username}")
             else:
                 print(f"✗ Failed to create contributor")      
                 sys.exit(1)
         
         elif args.action == 'add_pr':
-            import json
             labels = json.loads(args.labels) if args.labels else []
-            
-            pr_data = {
-                'pr_number': args.pr_number,
-                'repo_name': args.repo_name,
-                'pr_title': args.pr_title or '',
-                'lines_changed': args.lines_changed,
-                'labels': labels
-            }
+            pr_data = build_pr_data(args.pr_number, args.repo_name, args.pr_title, args.lines_changed, labels)
             
             success = manager.add_pr_to_contributor(args.username, pr_data)
-            if success:
+            if success and manager.flush():
                 print(f"✓ Added PR to contributor: {args.username}")
             else:
                 print("✗ Failed to add PR")
                 sys.exit(1)
+        
+        elif args.action == 'batch':
+            with open(args.batch_file, 'r') as f:
+                operations = json.load(f)
+            
+            # Reject malformed input before taking the lock and cloning
+            if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+                print("✗ Batch file must contain a JSON list of operation objects")
+                sys.exit(1)
+            
+            results = manager.run_batch(operations)
+            pushed = manager.flush()
+            if args.output_file:
+                write_output_file({'pushed': pushed, 'results': results}, args.output_file)
+            
+            failed = [r for r in results if not r['success']]
+            print(f"Processed {len(results)} operations, {len(failed)} failed")
+            if failed or not pushed:
+                print("✗ Batch did not complete cleanly")
+                sys.exit(1)
     
     except Exception as e:
         print(f"Error: {e}")
@@ -3,19 +3,41 @@ Utility functions for contributor automation.
 """
 
 import os
+import re
 import json
-import toml
+import string
+import functools
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 from typing import Dict, Any, Optional
 
 
+# Patterns for parsing onboarding comments
+_DISCORD_RE = re.compile(r'discord:\s*["\']?(\d{17,20})["\']?', re.IGNORECASE)
+_WALLET_RE = re.compile(r'wallet:\s*["\']?(0x[a-fA-F0-9]{40})["\']?', re.IGNORECASE)
+
+_HEX_DIGITS = frozenset(string.hexdigits)
+
+# Deletes every ASCII character that sanitize_filename doesn't keep
+_FILENAME_KEEP = frozenset(string.ascii_letters + string.digits + '-_')
+_FILENAME_TRANS = str.maketrans('', '', ''.join(chr(i) for i in range(128) if chr(i) not in _FILENAME_KEEP))
+
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> Dict[str, Any]:
-    """Load configuration from config.toml."""
+    """
+    Load configuration from config.toml.
+    Parsed once per process; callers share the returned dict and must not modify it.
+    """
     config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'config.toml')
     
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    return toml.load(config_path)
+    with open(config_path, 'rb') as f:
+        return tomllib.load(f)
 
 
 def write_output_file(data: Dict[str, Any], output_file: str):
@@ -29,6 +51,10 @@ def sanitize_filename(username: str) -> str:
     Sanitize username for use in filename.
     Removes special characters and converts to lowercase.
     """
+    # GitHub usernames are ASCII, which str.translate filters in a single pass
+    if username.isascii():
+        return username.translate(_FILENAME_TRANS).lower()
+    
     # Remove special chars, keep alphanumeric, dash, underscore
     sanitized = ''.join(c for c in username if c.isalnum() or c in '-_')
     return sanitized.lower()
@@ -75,11 +101,7 @@ def validate_wallet_address(wallet: str) -> bool:
         return False
     
     # Check if it's valid hex (after 0x)
-    try:
-        int(wallet[2:], 16)
-        return True
-    except ValueError:
-        return False
+    return _HEX_DIGITS.issuperset(wallet[2:])
 
 
 def parse_contributor_comment(comment_body: str) -> Optional[Dict[str, str]]:
@@ -90,10 +112,8 @@ def parse_contributor_comment(comment_body: str) -> Optional[Dict[str, str]]:
     discord: "123456789012345678"
     wallet: "0x1234567890abcdef1234567890abcdef12345678"
     """
-    import re
-    
-    discord_match = re.search(r'discord:\s*["\']?(\d{17,20})["\']?', comment_body, re.IGNORECASE)
-    wallet_match = re.search(r'wallet:\s*["\']?(0x[a-fA-F0-9]{40})["\']?', comment_body, re.IGNORECASE)
+    discord_match = _DISCORD_RE.search(comment_body)
+    wallet_match = _WALLET_RE.search(comment_body)
     
     if not discord_match or not wallet_match:
         return None